@@ -0,0 +1,41 @@
+"""Backend implementations for qcinf.
+
+Backend modules (and the third-party libraries they wrap, e.g., RDKit) are imported
+lazily on first use via `_resolve_backend`, so importing qcinf stays cheap.
+"""
+
+import importlib
+from typing import Any, Callable
+
+# "<module>.<function>" -> resolved callable
+_RESOLVED_BACKENDS: dict[str, Callable[..., Any]] = {}
+
+
+def _resolve_backend(backend_map: dict[str, str], backend: str) -> Callable[..., Any]:
+    """
+    Return the backend function registered for `backend` in `backend_map`.
+
+    Args:
+        backend_map: Maps backend names to "<module>.<function>" paths relative to
+            `qcinf._backends`, e.g., `{"rdkit": "rdkit._rmsd_rdkit"}`.
+        backend: The (case-insensitive) name of the backend.
+
+    Returns:
+        The backend function. Its module is imported on first use and cached.
+
+    Raises:
+        ValueError: If the backend is not in `backend_map`.
+    """
+    try:
+        path = backend_map[backend.lower()]
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown backend '{backend}'.  Known: {list(backend_map)}"
+        ) from e
+    try:
+        return _RESOLVED_BACKENDS[path]
+    except KeyError:
+        module, _, name = path.rpartition(".")
+        fn = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+        _RESOLVED_BACKENDS[path] = fn
+        return fn
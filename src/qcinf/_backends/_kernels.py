@@ -0,0 +1,452 @@
+"""Compiled numerical kernels for the native qcinf backend.
+
+Kernels are compiled with Numba when it is installed. Without Numba they are plain
+Python functions; callers should prefer their NumPy code paths in that case (check
+`_NUMBA_ERR`).
+"""
+
+import math
+from contextlib import contextmanager
+from typing import Callable, Iterator, Union
+
+import numpy as np
+
+try:
+    import numba
+except ModuleNotFoundError as _e:
+    _NUMBA_ERR: Union[Exception, None] = _e
+else:
+    _NUMBA_ERR = None
+
+
+def njit(*signatures, **options) -> Callable[[Callable], Callable]:
+    """`numba.njit(...)` if Numba is installed, otherwise a no-op decorator."""
+    if _NUMBA_ERR is None:
+        return numba.njit(*signatures, **options)
+    return lambda func: func
+
+
+prange = numba.prange if _NUMBA_ERR is None else range
+
+
+@contextmanager
+def num_threads(n: Union[int, None]) -> Iterator[None]:
+    """
+    Run the parallel kernels with `n` threads within the context.
+
+    `None` (or no Numba) keeps the current setting, which defaults to all cores or
+    `NUMBA_NUM_THREADS`. The threading layer is Numba's default; set
+    `NUMBA_THREADING_LAYER` to pick another, e.g., `workqueue` if a process that has
+    run the parallel kernels hangs at exit with TBB after starting subprocesses.
+    """
+    if n is None or _NUMBA_ERR is not None:
+        yield
+        return
+    previous = numba.get_num_threads()
+    numba.set_num_threads(n)
+    try:
+        yield
+    finally:
+        numba.set_num_threads(previous)
+
+
+# Explicit signatures for the pairwise RMSD kernels behind `rmsd(..., backend="qcinf")`.
+# They are compiled eagerly (and cached) for C-contiguous inputs only, so LLVM can
+# assume unit-stride access when vectorizing the inner loops. `compute_rmsd` always
+# passes C-contiguous double precision arrays. The other entry points (e.g., the
+# parallel filter kernel) compile lazily on first use; their callers also normalize
+# inputs with `np.ascontiguousarray`, so Numba specializes them for C-contiguous
+# arrays of the dtype actually used.
+_PAIR_SIGNATURES = ["float64(float64[:, ::1], float64[:, ::1], boolean)"]
+_CENTERED_PAIR_SIGNATURES = ["float64(float64[:, ::1], float64[:, ::1])"]
+
+
+# Relative convergence threshold for the Newton iterations on the largest eigenvalue
+_QCP_EVAL_PREC = 1e-11
+# Relative threshold below which the adjugate eigenvector is considered degenerate
+_QCP_EVEC_PREC = 1e-4
+_QCP_MAX_ITER = 50
+_JACOBI_MAX_SWEEPS = 50
+
+
+# --- internal helpers (defined first: entry points are compiled eagerly) --- #
+
+
+@njit(cache=True, fastmath=True)
+def _quat_to_rotation(q0, q1, q2, q3, qsqr):
+    """Row-major rotation matrix for the (not necessarily normalized) quaternion q."""
+    inv = 1.0 / qsqr
+    a2, x2, y2, z2 = q0 * q0 * inv, q1 * q1 * inv, q2 * q2 * inv, q3 * q3 * inv
+    xy, az, zx = q1 * q2 * inv, q0 * q3 * inv, q3 * q1 * inv
+    ay, yz, ax = q0 * q2 * inv, q2 * q3 * inv, q0 * q1 * inv
+    return (
+        a2 + x2 - y2 - z2,
+        2.0 * (xy - az),
+        2.0 * (zx + ay),
+        2.0 * (xy + az),
+        a2 - x2 + y2 - z2,
+        2.0 * (yz - ax),
+        2.0 * (zx - ay),
+        2.0 * (yz + ax),
+        a2 - x2 - y2 + z2,
+    )
+
+
+@njit(cache=True, fastmath=True)
+def _sym4_det(k00, k01, k02, k03, k11, k12, k13, k22, k23, k33):
+    """Determinant of a symmetric 4x4 matrix given its upper triangle."""
+    # 2x2 minors of rows (0, 1) and rows (2, 3)
+    s0 = k00 * k11 - k01 * k01
+    s1 = k00 * k12 - k01 * k02
+    s2 = k00 * k13 - k01 * k03
+    s3 = k01 * k12 - k11 * k02
+    s4 = k01 * k13 - k11 * k03
+    s5 = k02 * k13 - k12 * k03
+    c0 = k02 * k13 - k03 * k12
+    c1 = k02 * k23 - k03 * k22
+    c2 = k02 * k33 - k03 * k23
+    c3 = k12 * k23 - k13 * k22
+    c4 = k12 * k33 - k13 * k23
+    c5 = k22 * k33 - k23 * k23
+    return s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0
+
+
+@njit(cache=True, fastmath=True)
+def _sym4_adjugate_max_column(a00, a01, a02, a03, a11, a12, a13, a22, a23, a33):
+    """Column of largest norm of the adjugate of a symmetric 4x4 matrix."""
+    # 2x2 minors of rows (0, 1) and rows (2, 3)
+    s0 = a00 * a11 - a01 * a01
+    s1 = a00 * a12 - a01 * a02
+    s2 = a00 * a13 - a01 * a03
+    s3 = a01 * a12 - a11 * a02
+    s4 = a01 * a13 - a11 * a03
+    s5 = a02 * a13 - a12 * a03
+    c0 = a02 * a13 - a03 * a12
+    c1 = a02 * a23 - a03 * a22
+    c2 = a02 * a33 - a03 * a23
+    c3 = a12 * a23 - a13 * a22
+    c4 = a12 * a33 - a13 * a23
+    c5 = a22 * a33 - a23 * a23
+
+    # The adjugate is symmetric so its columns equal its rows
+    b00 = a11 * c5 - a12 * c4 + a13 * c3
+    b01 = -a01 * c5 + a02 * c4 - a03 * c3
+    b02 = a13 * s5 - a23 * s4 + a33 * s3
+    b03 = -a12 * s5 + a22 * s4 - a23 * s3
+    b11 = a00 * c5 - a02 * c2 + a03 * c1
+    b12 = -a03 * s5 + a23 * s2 - a33 * s1
+    b13 = a02 * s5 - a22 * s2 + a23 * s1
+    b22 = a03 * s4 - a13 * s2 + a33 * s0
+    b23 = -a02 * s4 + a12 * s2 - a23 * s0
+    b33 = a02 * s3 - a12 * s1 + a22 * s0
+
+    n0 = b00 * b00 + b01 * b01 + b02 * b02 + b03 * b03
+    n1 = b01 * b01 + b11 * b11 + b12 * b12 + b13 * b13
+    n2 = b02 * b02 + b12 * b12 + b22 * b22 + b23 * b23
+    n3 = b03 * b03 + b13 * b13 + b23 * b23 + b33 * b33
+    if n0 >= n1 and n0 >= n2 and n0 >= n3:
+        return b00, b01, b02, b03
+    elif n1 >= n2 and n1 >= n3:
+        return b01, b11, b12, b13
+    elif n2 >= n3:
+        return b02, b12, b22, b23
+    return b03, b13, b23, b33
+
+
+@njit(cache=True)
+def _sym4_max_eigvec(k00, k01, k02, k03, k11, k12, k13, k22, k23, k33):
+    """Eigenvector of the largest eigenvalue of a symmetric 4x4 matrix (Jacobi)."""
+    A = np.empty((4, 4))
+    A[0, 0], A[0, 1], A[0, 2], A[0, 3] = k00, k01, k02, k03
+    A[1, 0], A[1, 1], A[1, 2], A[1, 3] = k01, k11, k12, k13
+    A[2, 0], A[2, 1], A[2, 2], A[2, 3] = k02, k12, k22, k23
+    A[3, 0], A[3, 1], A[3, 2], A[3, 3] = k03, k13, k23, k33
+    V = np.eye(4)
+    scale = 0.0
+    for p in range(4):
+        for q in range(4):
+            scale += A[p, q] * A[p, q]
+
+    for _ in range(_JACOBI_MAX_SWEEPS):
+        off = 0.0
+        for p in range(3):
+            for q in range(p + 1, 4):
+                off += A[p, q] * A[p, q]
+        if off <= 1e-30 * scale:
+            break
+        for p in range(3):
+            for q in range(p + 1, 4):
+                if A[p, q] == 0.0:
+                    continue
+                theta = (A[q, q] - A[p, p]) / (2.0 * A[p, q])
+                t = 1.0 / (abs(theta) + math.sqrt(theta * theta + 1.0))
+                if theta < 0.0:
+                    t = -t
+                c = 1.0 / math.sqrt(t * t + 1.0)
+                s = t * c
+                for k in range(4):
+                    akp = A[k, p]
+                    akq = A[k, q]
+                    A[k, p] = c * akp - s * akq
+                    A[k, q] = s * akp + c * akq
+                for k in range(4):
+                    apk = A[p, k]
+                    aqk = A[q, k]
+                    A[p, k] = c * apk - s * aqk
+                    A[q, k] = s * apk + c * aqk
+                for k in range(4):
+                    vkp = V[k, p]
+                    vkq = V[k, q]
+                    V[k, p] = c * vkp - s * vkq
+                    V[k, q] = s * vkp + c * vkq
+
+    imax = 0
+    for i in range(1, 4):
+        if A[i, i] > A[imax, imax]:
+            imax = i
+    return V[0, imax], V[1, imax], V[2, imax], V[3, imax]
+
+
+@njit(cache=True, fastmath=True)
+def _qcp_rotation(Sxx, Sxy, Sxz, Syx, Syy, Syz, Szx, Szy, Szz):
+    """
+    Row-major elements of the optimal rotation for the cross-covariance matrix S.
+
+    The largest eigenvalue of Horn's symmetric 4x4 key matrix K is found by Newton
+    iterations on its characteristic polynomial (Theobald's QCP method) and the
+    corresponding eigenvector (a unit quaternion) is read off a column of the
+    adjugate of `K - lambda * I`.
+    """
+    # Unique elements of Horn's key matrix K (traceless and symmetric)
+    k00 = Sxx + Syy + Szz
+    k01 = Syz - Szy
+    k02 = Szx - Sxz
+    k03 = Sxy - Syx
+    k11 = Sxx - Syy - Szz
+    k12 = Sxy + Syx
+    k13 = Szx + Sxz
+    k22 = -Sxx + Syy - Szz
+    k23 = Syz + Szy
+    k33 = -Sxx - Syy + Szz
+
+    # Characteristic polynomial: lambda^4 + c2 * lambda^2 + c1 * lambda + c0
+    h_norm2 = (
+        Sxx * Sxx + Sxy * Sxy + Sxz * Sxz
+        + Syx * Syx + Syy * Syy + Syz * Syz
+        + Szx * Szx + Szy * Szy + Szz * Szz
+    )  # fmt: skip
+    det_H = (
+        Sxx * (Syy * Szz - Syz * Szy)
+        - Sxy * (Syx * Szz - Syz * Szx)
+        + Sxz * (Syx * Szy - Syy * Szx)
+    )
+    c2 = -2.0 * h_norm2
+    c1 = -8.0 * det_H
+    c0 = _sym4_det(k00, k01, k02, k03, k11, k12, k13, k22, k23, k33)
+
+    # The sum of the singular values of H bounds the largest eigenvalue from above, so
+    # Newton's method started at sqrt(3) * ||H|| converges monotonically onto it.
+    lam = math.sqrt(3.0 * h_norm2)
+    if lam == 0.0:  # All points coincide with their centroid
+        return 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0
+    for _ in range(_QCP_MAX_ITER):
+        lam2 = lam * lam
+        b = (lam2 + c2) * lam
+        a = b + c1
+        delta = (a * lam + c0) / (2.0 * lam2 * lam + b + a)
+        lam -= delta
+        if abs(delta) < _QCP_EVAL_PREC * abs(lam):
+            break
+
+    # Eigenvector of K for lambda: the largest column of adj(K - lambda * I)
+    q0, q1, q2, q3 = _sym4_adjugate_max_column(
+        k00 - lam, k01, k02, k03, k11 - lam, k12, k13, k22 - lam, k23, k33 - lam
+    )
+    qsqr = q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3
+    evec_prec = _QCP_EVEC_PREC * lam * lam * lam
+    if qsqr < evec_prec * evec_prec:
+        # Degenerate largest eigenvalue (e.g., linear molecules) zeroes the adjugate;
+        # any unit vector in the eigenspace is optimal so take one from Jacobi.
+        q0, q1, q2, q3 = _sym4_max_eigvec(
+            k00, k01, k02, k03, k11, k12, k13, k22, k23, k33
+        )
+        qsqr = q0 * q0 + q1 * q1 + q2 * q2 + q3 * q3
+
+    return _quat_to_rotation(q0, q1, q2, q3, qsqr)
+
+
+@njit(cache=True, fastmath=True)
+def _covariance_3x3(P, Q, cPx, cPy, cPz, cQx, cQy, cQz):
+    """Row-major elements of `(P - cP).T @ (Q - cQ)` accumulated as scalars."""
+    Sxx = Sxy = Sxz = Syx = Syy = Syz = Szx = Szy = Szz = 0.0
+    for i in range(P.shape[0]):
+        px = P[i, 0] - cPx
+        py = P[i, 1] - cPy
+        pz = P[i, 2] - cPz
+        qx = Q[i, 0] - cQx
+        qy = Q[i, 1] - cQy
+        qz = Q[i, 2] - cQz
+        Sxx += px * qx
+        Sxy += px * qy
+        Sxz += px * qz
+        Syx += py * qx
+        Syy += py * qy
+        Syz += py * qz
+        Szx += pz * qx
+        Szy += pz * qy
+        Szz += pz * qz
+    return Sxx, Sxy, Sxz, Syx, Syy, Syz, Szx, Szy, Szz
+
+
+@njit(cache=True, fastmath=True)
+def _aligned_rmsd(P, Q, cPx, cPy, cPz, cQx, cQy, cQz) -> float:
+    """Aligned RMSD between P and Q given their centroids."""
+    n = P.shape[0]
+    Sxx, Sxy, Sxz, Syx, Syy, Syz, Szx, Szy, Szz = _covariance_3x3(
+        P, Q, cPx, cPy, cPz, cQx, cQy, cQz
+    )
+    r00, r01, r02, r10, r11, r12, r20, r21, r22 = _qcp_rotation(
+        Sxx, Sxy, Sxz, Syx, Syy, Syz, Szx, Szy, Szz
+    )
+
+    sum_sq = 0.0
+    for i in range(n):
+        px = P[i, 0] - cPx
+        py = P[i, 1] - cPy
+        pz = P[i, 2] - cPz
+        dx = r00 * px + r01 * py + r02 * pz - (Q[i, 0] - cQx)
+        dy = r10 * px + r11 * py + r12 * pz - (Q[i, 1] - cQy)
+        dz = r20 * px + r21 * py + r22 * pz - (Q[i, 2] - cQz)
+        sum_sq += dx * dx + dy * dy + dz * dz
+    return math.sqrt(sum_sq / n)
+
+
+@njit(cache=True, fastmath=True)
+def _centered_rmsd_soa(px, py, pz, qx, qy, qz) -> float:
+    """
+    Aligned RMSD between centered coordinates given as separate x, y, z columns.
+
+    Each atom loop reads unit-stride columns, so it vectorizes over atoms.
+    """
+    n = px.shape[0]
+    Sxx = Sxy = Sxz = Syx = Syy = Syz = Szx = Szy = Szz = 0.0
+    for i in range(n):
+        Sxx += px[i] * qx[i]
+        Sxy += px[i] * qy[i]
+        Sxz += px[i] * qz[i]
+        Syx += py[i] * qx[i]
+        Syy += py[i] * qy[i]
+        Syz += py[i] * qz[i]
+        Szx += pz[i] * qx[i]
+        Szy += pz[i] * qy[i]
+        Szz += pz[i] * qz[i]
+    r00, r01, r02, r10, r11, r12, r20, r21, r22 = _qcp_rotation(
+        Sxx, Sxy, Sxz, Syx, Syy, Syz, Szx, Szy, Szz
+    )
+
+    sum_sq = 0.0
+    for i in range(n):
+        dx = r00 * px[i] + r01 * py[i] + r02 * pz[i] - qx[i]
+        dy = r10 * px[i] + r11 * py[i] + r12 * pz[i] - qy[i]
+        dz = r20 * px[i] + r21 * py[i] + r22 * pz[i] - qz[i]
+        sum_sq += dx * dx + dy * dy + dz * dz
+    return math.sqrt(sum_sq / n)
+
+
+# --- entry points --- #
+
+
+@njit(_PAIR_SIGNATURES, cache=True, fastmath=True)
+def _rmsd_kernel(P: np.ndarray, Q: np.ndarray, align: bool) -> float:
+    """
+    RMSD between two (N, 3) coordinate arrays, optionally after optimal superposition.
+
+    Centroids, the cross-covariance matrix, and the residual are accumulated in
+    scalar loops so no temporary arrays are allocated.
+    """
+    n = P.shape[0]
+    if not align:
+        sum_sq = 0.0
+        for i in range(n):
+            dx = P[i, 0] - Q[i, 0]
+            dy = P[i, 1] - Q[i, 1]
+            dz = P[i, 2] - Q[i, 2]
+            sum_sq += dx * dx + dy * dy + dz * dz
+        return math.sqrt(sum_sq / n)
+
+    cPx = cPy = cPz = cQx = cQy = cQz = 0.0
+    for i in range(n):
+        cPx += P[i, 0]
+        cPy += P[i, 1]
+        cPz += P[i, 2]
+        cQx += Q[i, 0]
+        cQy += Q[i, 1]
+        cQz += Q[i, 2]
+    return _aligned_rmsd(P, Q, cPx / n, cPy / n, cPz / n, cQx / n, cQy / n, cQz / n)
+
+
+@njit(_CENTERED_PAIR_SIGNATURES, cache=True, fastmath=True)
+def _rmsd_centered(P: np.ndarray, Q: np.ndarray) -> float:
+    """Aligned RMSD between two (N, 3) coordinate arrays already centered at 0."""
+    return _aligned_rmsd(P, Q, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+@njit(cache=True, fastmath=True)
+def _rotation_centered(P: np.ndarray, Q: np.ndarray) -> np.ndarray:
+    """
+    Return the optimal rotation of (N, 3) centered coordinates P onto Q.
+
+    The covariance matrix is accumulated in scalars (no `P.T @ Q` dispatch).
+    """
+    r00, r01, r02, r10, r11, r12, r20, r21, r22 = _qcp_rotation(
+        *_covariance_3x3(P, Q, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    )
+    R = np.empty((3, 3))
+    R[0, 0], R[0, 1], R[0, 2] = r00, r01, r02
+    R[1, 0], R[1, 1], R[1, 2] = r10, r11, r12
+    R[2, 0], R[2, 1], R[2, 2] = r20, r21, r22
+    return R
+
+
+@njit(cache=True)
+def _quat_rotation_3x3(H: np.ndarray) -> np.ndarray:
+    """
+    Return the proper rotation matrix R maximizing `trace(R @ H.T)`.
+
+    H is the cross-covariance matrix `P_centered.T @ Q_centered`.
+    """
+    r00, r01, r02, r10, r11, r12, r20, r21, r22 = _qcp_rotation(
+        H[0, 0], H[0, 1], H[0, 2], H[1, 0], H[1, 1], H[1, 2], H[2, 0], H[2, 1], H[2, 2]
+    )
+    R = np.empty((3, 3))
+    R[0, 0], R[0, 1], R[0, 2] = r00, r01, r02
+    R[1, 0], R[1, 1], R[1, 2] = r10, r11, r12
+    R[2, 0], R[2, 1], R[2, 2] = r20, r21, r22
+    return R
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _filter_column(
+    i: int,
+    filtered: np.ndarray,
+    X: np.ndarray,
+    Y: np.ndarray,
+    Z: np.ndarray,
+    rg: np.ndarray,
+    threshold: float,
+) -> np.ndarray:
+    """
+    Flag the conformers j > i whose aligned RMSD to conformer i is below threshold.
+
+    The stack is given as (M, N) X, Y and Z arrays centered at the origin and rg
+    holds the radii of gyration. Conformers already flagged in `filtered`, and those
+    whose radius of gyration differs from that of i by at least the threshold (a
+    lower bound on their RMSD), are skipped. The rest are compared in parallel.
+    """
+    n_conformers = X.shape[0]
+    close = np.zeros(n_conformers, dtype=np.bool_)
+    for j in prange(i + 1, n_conformers):
+        if filtered[j] or abs(rg[j] - rg[i]) >= threshold:
+            continue
+        close[j] = _centered_rmsd_soa(X[i], Y[i], Z[i], X[j], Y[j], Z[j]) < threshold
+    return close
@@ -0,0 +1,192 @@
+"""Superposition (Kabsch/QCP) and RMSD routines for the native qcinf backend.
+
+These dispatch to the compiled kernels in `_kernels` when Numba is installed and
+fall back to NumPy otherwise. Kept apart from `utils` so that importing the other
+backends does not import (or compile) the kernels.
+"""
+
+import math
+
+import numpy as np
+
+from ._kernels import (
+    _NUMBA_ERR,
+    _filter_column,
+    _quat_rotation_3x3,
+    _rmsd_centered,
+    _rmsd_kernel,
+    _rotation_centered,
+)
+
+
+def kabsch(P: np.ndarray, Q: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the optimal rotation matrix that aligns P onto Q.
+
+    The rotation is obtained from the quaternion formulation of the superposition
+    problem (Horn, 1987) using the Quaternion Characteristic Polynomial (QCP) method
+    of Theobald (2005) rather than an SVD of the covariance matrix.
+
+    Args:
+        P: An (N, 3) array of coordinates to rotate.
+        Q: An (N, 3) array of reference coordinates.
+
+    Returns:
+        Tuple of the (3, 3) rotation matrix R and the centroids of P and Q such that
+        `(P - centroid_P) @ R.T + centroid_Q` is the optimal superposition of P on Q.
+    """
+    P = np.ascontiguousarray(P, dtype=np.float64)
+    Q = np.ascontiguousarray(Q, dtype=np.float64)
+    centroid_P = P.mean(axis=0)
+    centroid_Q = Q.mean(axis=0)
+    return kabsch_centered(P - centroid_P, Q - centroid_Q), centroid_P, centroid_Q
+
+
+def kabsch_centered(P_centered: np.ndarray, Q_centered: np.ndarray) -> np.ndarray:
+    """
+    Compute the optimal rotation matrix that aligns P onto Q for centered coordinates.
+
+    Same as `kabsch` but skips the centroid computation for coordinates that are
+    already centered at the origin (e.g., cached across many comparisons).
+
+    Args:
+        P_centered: An (N, 3) array of centered coordinates to rotate.
+        Q_centered: An (N, 3) array of centered reference coordinates.
+
+    Returns:
+        The (3, 3) rotation matrix R such that `P_centered @ R.T` is the optimal
+        superposition of P on Q.
+    """
+    if _NUMBA_ERR is None:
+        # Fused kernel: covariance in scalar registers, then the QCP solve
+        dtype = P_centered.dtype if P_centered.dtype == np.float32 else np.float64
+        return _rotation_centered(
+            np.ascontiguousarray(P_centered, dtype=dtype),
+            np.ascontiguousarray(Q_centered, dtype=dtype),
+        )
+
+    H = P_centered.T @ Q_centered
+    # The QCP solve always runs in double precision, whatever the input precision
+    return _quat_rotation_3x3(np.ascontiguousarray(H, dtype=np.float64))
+
+
+def compute_rmsd(
+    coords1: np.ndarray,
+    coords2: np.ndarray,
+    align: bool = True,
+    *,
+    centered: bool = False,
+) -> float:
+    """
+    Compute the RMSD between two sets of coordinates.
+
+    Args:
+        coords1: An (N, 3) array of coordinates.
+        coords2: An (N, 3) array of coordinates.
+        align: Whether to optimally superimpose coords1 onto coords2 before computing
+            the RMSD.
+        centered: Whether both sets of coordinates are already centered at the
+            origin, in which case the centroid computation is skipped.
+
+    Returns:
+        The RMSD in the same units as the input coordinates.
+    """
+    coords1 = np.ascontiguousarray(coords1, dtype=np.float64)
+    coords2 = np.ascontiguousarray(coords2, dtype=np.float64)
+    if _NUMBA_ERR is None:
+        if align and centered:
+            return _rmsd_centered(coords1, coords2)
+        return _rmsd_kernel(coords1, coords2, align)
+
+    if align and centered:
+        coords1 = np.dot(coords1, kabsch_centered(coords1, coords2).T)
+    elif align:
+        R, centroid_P, centroid_Q = kabsch(coords1, coords2)
+        coords1 = np.dot(coords1 - centroid_P, R.T) + centroid_Q
+    # One BLAS dot over the flattened residual; no (N, 3) temporary for diff**2.
+    diff = (coords1 - coords2).ravel()
+    return math.sqrt(np.dot(diff, diff) / coords1.shape[0])
+
+
+def compute_rmsd_batch_soa(
+    ref_coords: np.ndarray, coords: np.ndarray, mask: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the aligned RMSDs between a reference and a stack of centered coordinates
+    stored as structure-of-arrays.
+
+    All selected pairs go through NumPy's batched linear algebra (one stacked SVD),
+    so this is the path `filter_column_soa` takes without Numba.
+
+    Args:
+        ref_coords: A (3, N) array of centered reference coordinates.
+        coords: A (3, M, N) array of centered coordinates to compare to the reference,
+            e.g., `centered.transpose(2, 0, 1)` of an (M, N, 3) stack.
+        mask: An (M,) boolean array selecting which RMSDs to compute.
+
+    Returns:
+        An (M,) array of RMSDs. Entries not selected by the mask are infinite.
+    """
+    rmsds = np.full(coords.shape[1], np.inf)
+    selected = np.flatnonzero(mask)
+    if selected.size == 0:
+        return rmsds
+    ref = np.asarray(ref_coords, dtype=np.float64)  # (3, N)
+    others = np.asarray(coords[:, selected], dtype=np.float64)  # (3, K, N)
+    # Covariance matrices H_k = P.T @ Q_k of all K pairs, then one batched SVD
+    H_stack = np.einsum("an,bkn->kab", ref, others)
+    U, _, Vt = np.linalg.svd(H_stack)
+    R_stack = Vt.transpose(0, 2, 1) @ U.transpose(0, 2, 1)
+    # Proper rotations only: flip the smallest singular direction of reflections
+    reflected = np.linalg.det(R_stack) < 0
+    if reflected.any():
+        Vt[reflected, 2] *= -1
+        R_stack[reflected] = Vt[reflected].transpose(0, 2, 1) @ U[reflected].transpose(
+            0, 2, 1
+        )
+    diff = np.einsum("kba,an->bkn", R_stack, ref) - others
+    rmsds[selected] = np.sqrt(np.einsum("bkn,bkn->k", diff, diff) / ref.shape[1])
+    return rmsds
+
+
+def filter_column_soa(
+    i: int,
+    filtered: np.ndarray,
+    coords: np.ndarray,
+    rg: np.ndarray,
+    threshold: float,
+) -> np.ndarray:
+    """
+    Flag the conformers after conformer i that are within an RMSD threshold of it.
+
+    Args:
+        i: The index of the reference conformer.
+        filtered: An (M,) boolean array of conformers already filtered out; these
+            are skipped.
+        coords: A (3, M, N) array of centered coordinates (structure-of-arrays).
+        rg: An (M,) array of radii of gyration. Conformers whose radius differs from
+            that of i by at least the threshold are skipped, since that difference
+            is a lower bound on the RMSD.
+        threshold: The RMSD threshold.
+
+    Returns:
+        An (M,) boolean array, True for the conformers j > i with an aligned RMSD to
+        conformer i below the threshold.
+    """
+    if _NUMBA_ERR is None:
+        dtype = coords.dtype if coords.dtype in (np.float32, np.float64) else np.float64
+        X, Y, Z = (np.ascontiguousarray(c, dtype=dtype) for c in coords)
+        return _filter_column(
+            i,
+            np.ascontiguousarray(filtered, dtype=bool),
+            X,
+            Y,
+            Z,
+            np.ascontiguousarray(rg, dtype=np.float64),
+            float(threshold),
+        )
+
+    candidates = ~filtered
+    candidates[: i + 1] = False
+    candidates &= np.abs(rg - rg[i]) < threshold
+    return compute_rmsd_batch_soa(coords[:, i], coords, candidates) < threshold
@@ -0,0 +1,208 @@
+"""CuPy (GPU) backend for qcinf."""
+
+import functools
+from typing import Callable, TypeVar, Union
+
+import numpy as np
+from qcconst import constants
+from qcio import LengthUnit, Structure
+from typing_extensions import ParamSpec
+
+from .qcinf import _check_compatible, _filter_conformers_indices_qcinf
+
+try:
+    import cupy as cp
+except ModuleNotFoundError as _e:
+    _CUPY_ERR: Union[Exception, None] = _e
+else:
+    _CUPY_ERR = None
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def requires_cupy(func: Callable[P, R]) -> Callable[P, R]:
+    """
+    Decorator that raises a clean error *at call-time* if CuPy
+    isn't installed.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:  # type: ignore[misc]
+        if _CUPY_ERR is not None:
+            raise ModuleNotFoundError(
+                "Optional dependency 'cupy' is not installed. "
+                "Install with: python -m pip install 'qcinf[cupy]'."
+            ) from _CUPY_ERR
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+# Below this many atoms in total (conformers x atoms) the host <-> device copies
+# cost more than they save and the CPU implementation is used instead.
+_GPU_MIN_SIZE = 100_000
+# Upper bound on the device memory used for one block of covariance matrices
+_GPU_BLOCK_BYTES = 2**28
+_CUDA_THREADS_PER_BLOCK = 256
+
+_QCP_CLOSE_SOURCE = r"""
+extern "C" __global__
+void qcp_close(const double* H, const double* G_rows, const double* G_cols,
+               const long long n_rows, const long long n_cols, const double n_atoms,
+               const double threshold_sq, bool* close)
+{
+    const long long idx = (long long)blockDim.x * blockIdx.x + threadIdx.x;
+    if (idx >= n_rows * n_cols) return;
+    const long long i = idx / n_cols;
+    const long long j = idx - i * n_cols;
+
+    const double* S = H + 9 * idx;
+    const double Sxx = S[0], Sxy = S[1], Sxz = S[2];
+    const double Syx = S[3], Syy = S[4], Syz = S[5];
+    const double Szx = S[6], Szy = S[7], Szz = S[8];
+
+    // Unique elements of Horn's key matrix K
+    const double k00 = Sxx + Syy + Szz, k01 = Syz - Szy, k02 = Szx - Sxz;
+    const double k03 = Sxy - Syx, k11 = Sxx - Syy - Szz, k12 = Sxy + Syx;
+    const double k13 = Szx + Sxz, k22 = -Sxx + Syy - Szz, k23 = Syz + Szy;
+    const double k33 = -Sxx - Syy + Szz;
+
+    // Characteristic polynomial: lambda^4 + c2 * lambda^2 + c1 * lambda + c0
+    const double c2 = -2.0 * (Sxx * Sxx + Sxy * Sxy + Sxz * Sxz
+                              + Syx * Syx + Syy * Syy + Syz * Syz
+                              + Szx * Szx + Szy * Szy + Szz * Szz);
+    const double c1 = -8.0 * (Sxx * (Syy * Szz - Syz * Szy)
+                              - Sxy * (Syx * Szz - Syz * Szx)
+                              + Sxz * (Syx * Szy - Syy * Szx));
+    const double s0 = k00 * k11 - k01 * k01, s1 = k00 * k12 - k01 * k02;
+    const double s2 = k00 * k13 - k01 * k03, s3 = k01 * k12 - k11 * k02;
+    const double s4 = k01 * k13 - k11 * k03, s5 = k02 * k13 - k12 * k03;
+    const double m0 = k02 * k13 - k03 * k12, m1 = k02 * k23 - k03 * k22;
+    const double m2 = k02 * k33 - k03 * k23, m3 = k12 * k23 - k13 * k22;
+    const double m4 = k12 * k33 - k13 * k23, m5 = k22 * k33 - k23 * k23;
+    const double c0 = s0 * m5 - s1 * m4 + s2 * m3 + s3 * m2 - s4 * m1 + s5 * m0;
+
+    // E0 = (G_i + G_j) / 2 bounds the largest eigenvalue from above
+    const double g = G_rows[i] + G_cols[j];
+    double lam = 0.5 * g;
+    for (int it = 0; it < 50; ++it) {
+        const double lam2 = lam * lam;
+        const double b = (lam2 + c2) * lam;
+        const double a = b + c1;
+        const double delta = (a * lam + c0) / (2.0 * lam2 * lam + b + a);
+        lam -= delta;
+        if (fabs(delta) < 1e-11 * fabs(lam)) break;
+    }
+
+    const double msd = fmax((g - 2.0 * lam) / n_atoms, 0.0);
+    close[idx] = msd < threshold_sq;
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _qcp_close_kernel() -> "cp.RawKernel":
+    """Compile (once) the QCP kernel flagging pairs with RMSD below a threshold."""
+    return cp.RawKernel(_QCP_CLOSE_SOURCE, "qcp_close")
+
+
+# --- main wrapper functions for cupy --- #
+
+
+@requires_cupy
+def _filter_conformers_indices_cupy(
+    conformers: list[Structure],
+    threshold: float = 1.0,
+    *,
+    symmetry: bool = False,
+    align: bool = True,
+    length_unit: LengthUnit = LengthUnit.BOHR,
+    gpu_min_size: int = _GPU_MIN_SIZE,
+) -> list[int]:
+    """
+    Filter conformers based on RMSD threshold on the GPU.
+
+    Covariance matrices for a block of conformers against all conformers come from
+    a single gemm on the device. A custom kernel then finds the largest eigenvalue
+    of each pair's quaternion key matrix with the QCP method, avoiding the slow
+    batched `gesvd`/`gesvdj` on tiny matrices, and flags the pairs below the
+    threshold. Only this boolean mask is copied back to the host for the greedy
+    filtering.
+
+    Args:
+        conformers: A list of Structure objects to filter. Atoms are assumed to be
+            indexed identically across the conformers.
+        threshold: The RMSD threshold for filtering in Bohr (or `length_unit`).
+        symmetry: Symmetry (atom renumbering) is not supported by this backend. Pass
+            `backend="rdkit"` to consider symmetries.
+        align: Whether to optimally superimpose each pair of conformers before
+            calculating their RMSD. Unaligned RMSDs are computed on the CPU.
+        length_unit: The unit of length of the threshold. Default is "bohr".
+        gpu_min_size: Minimum number of conformers x atoms for which the GPU is
+            used. Smaller inputs are filtered on the CPU (`backend="qcinf"`) since
+            the host-device copies would dominate.
+
+    Returns:
+        List of conformers indices that meet the RMSD threshold.
+    """
+    if not conformers:
+        return []
+    n_conformers = len(conformers)
+    n_atoms = len(conformers[0].symbols)
+    if not align or n_conformers * n_atoms < gpu_min_size:
+        return _filter_conformers_indices_qcinf(
+            conformers,
+            threshold,
+            symmetry=symmetry,
+            align=align,
+            length_unit=length_unit,
+        )
+    if length_unit == LengthUnit.ANGSTROM:
+        threshold = threshold * constants.ANGSTROM_TO_BOHR
+    for conformer in conformers[1:]:
+        _check_compatible(conformers[0], conformer, symmetry)
+
+    geoms = np.stack([conformer.geometry for conformer in conformers])
+    centered = cp.asarray(geoms - geoms.mean(axis=1)[:, None, :])
+    G = (centered**2).sum(axis=(1, 2))
+    # Rows (m, a) hold coordinate a of every atom of conformer m, so X @ X.T holds
+    # all 3x3 covariance matrices: (X @ X.T)[3 * m + a, 3 * k + c] = H_mk[a, c]
+    X = cp.ascontiguousarray(centered.transpose(0, 2, 1).reshape(3 * n_conformers, -1))
+
+    kernel = _qcp_close_kernel()
+    block_size = max(1, _GPU_BLOCK_BYTES // (2 * 9 * 8 * n_conformers))
+    filtered = np.zeros(n_conformers, dtype=bool)
+    for start in range(0, n_conformers, block_size):
+        # Rows already filtered by earlier blocks need no RMSDs
+        rows = start + np.flatnonzero(~filtered[start : start + block_size])
+        if rows.size == 0:
+            continue
+        X_rows = X.reshape(n_conformers, 3, -1)[cp.asarray(rows)].reshape(
+            3 * rows.size, -1
+        )
+        H = (X_rows @ X.T).reshape(rows.size, 3, n_conformers, 3)
+        H = cp.ascontiguousarray(H.transpose(0, 2, 1, 3))
+        close = cp.empty((rows.size, n_conformers), dtype=cp.bool_)
+        n_pairs = close.size
+        kernel(
+            ((n_pairs + _CUDA_THREADS_PER_BLOCK - 1) // _CUDA_THREADS_PER_BLOCK,),
+            (_CUDA_THREADS_PER_BLOCK,),
+            (
+                H,
+                G[cp.asarray(rows)],
+                G,
+                np.int64(rows.size),
+                np.int64(n_conformers),
+                np.float64(n_atoms),
+                np.float64(threshold * threshold),
+                close,
+            ),
+        )
+        close_host = cp.asnumpy(close)
+        for r, i in enumerate(rows):
+            if not filtered[i]:
+                filtered[i + 1 :] |= close_host[r, i + 1 :]
+
+    return np.flatnonzero(~filtered).tolist()
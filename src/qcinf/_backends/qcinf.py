@@ -0,0 +1,236 @@
+"""Native (NumPy) backend for qcinf."""
+
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+from qcconst import constants
+from qcio import LengthUnit, Structure
+
+from . import _kernels
+from ._superposition import (
+    compute_rmsd,
+    filter_column_soa,
+    kabsch,
+    kabsch_centered,
+)
+from .utils import aligned_empty
+
+# --- main wrapper functions for qcinf --- #
+
+
+def _rmsd_qcinf(
+    struct1: Structure,
+    struct2: Structure,
+    *,
+    symmetry: bool = False,
+    align: bool = True,
+    length_unit: LengthUnit = LengthUnit.BOHR,
+) -> float:
+    """
+    Calculate the root mean square deviation between two structures in Bohr or Angstrom.
+
+    Atoms are assumed to be indexed identically across the two structures.
+
+    Args:
+        struct1: The first structure.
+        struct2: The second structure.
+        symmetry: Symmetry (atom renumbering) is not supported by this backend. Pass
+            `backend="rdkit"` to consider symmetries.
+        align: Whether to optimally superimpose the structures before calculating the
+            RMSD.
+        length_unit: The unit of length to use for the RMSD calculation. Default is
+            "bohr". If "angstrom", the RMSD will be in Angstroms.
+
+    Returns:
+        The RMSD between the two structures.
+    """
+    _check_compatible(struct1, struct2, symmetry)
+    rmsd = compute_rmsd(struct1.geometry, struct2.geometry, align=align)
+    return (
+        rmsd * constants.BOHR_TO_ANGSTROM
+        if length_unit == LengthUnit.ANGSTROM
+        else rmsd
+    )
+
+
+def _align_qcinf(
+    struct: Structure,
+    refstruct: Structure,
+    *,
+    symmetry: bool = False,
+    length_unit: LengthUnit = LengthUnit.BOHR,
+) -> tuple[Structure, float]:
+    """
+    Return a new structure that is optimally aligned to the reference structure and
+    the RMSD between the two structures in Bohr or Angstroms.
+
+    Atoms are assumed to be indexed identically across the two structures.
+
+    Args:
+        struct: The structure to align.
+        refstruct: The reference structure.
+        symmetry: Symmetry (atom renumbering) is not supported by this backend. Pass
+            `backend="rdkit"` to consider symmetries.
+        length_unit: The unit of length to use for the RMSD calculation. Default is
+            "bohr". If "angstrom", the RMSD will be in Angstroms.
+
+    Returns:
+        Tuple of the aligned structure and the RMSD.
+    """
+    _check_compatible(struct, refstruct, symmetry)
+    R, centroid_P, centroid_Q = kabsch(struct.geometry, refstruct.geometry)
+    # The new geometry is already valid; deep copy so `struct` is not aliased
+    aligned = struct.model_copy(
+        update={"geometry": np.dot(struct.geometry - centroid_P, R.T) + centroid_Q},
+        deep=True,
+    )
+    rmsd = compute_rmsd(aligned.geometry, refstruct.geometry, align=False)
+    return (
+        aligned,
+        rmsd * constants.BOHR_TO_ANGSTROM
+        if length_unit == LengthUnit.ANGSTROM
+        else rmsd,
+    )
+
+
+def _align_batch_qcinf(
+    structs: list[Structure],
+    refstruct: Structure,
+    *,
+    symmetry: bool = False,
+) -> list[Structure]:
+    """
+    Return new structures that are each optimally aligned to the reference structure.
+
+    Equivalent to calling `_align_qcinf` on every structure, but the reference is
+    centered only once and all rotations are applied in a single batched operation.
+
+    Args:
+        structs: The structures to align. Atoms are assumed to be indexed identically
+            to the reference structure.
+        refstruct: The reference structure.
+        symmetry: Symmetry (atom renumbering) is not supported by this backend. Pass
+            `backend="rdkit"` to consider symmetries.
+
+    Returns:
+        The aligned structures, in the same order as `structs`.
+    """
+    if not structs:
+        return []
+    for struct in structs:
+        _check_compatible(struct, refstruct, symmetry)
+
+    centroid_Q = refstruct.geometry.mean(axis=0)
+    Q_centered = refstruct.geometry - centroid_Q
+    geoms = np.stack([struct.geometry for struct in structs])
+    centered = geoms - geoms.mean(axis=1)[:, None, :]
+    Rs = np.stack([kabsch_centered(P_centered, Q_centered) for P_centered in centered])
+    aligned = np.einsum("mij,mnj->mni", Rs, centered) + centroid_Q
+
+    # Geometries are already valid; deep copies so no input is aliased
+    return [
+        struct.model_copy(update={"geometry": geometry}, deep=True)
+        for struct, geometry in zip(structs, aligned)
+    ]
+
+
+def _filter_conformers_indices_qcinf(
+    conformers: list[Structure],
+    threshold: float = 1.0,
+    *,
+    symmetry: bool = False,
+    align: bool = True,
+    length_unit: LengthUnit = LengthUnit.BOHR,
+    dtype: npt.DTypeLike = np.float32,
+    num_threads: Union[int, None] = None,
+) -> list[int]:
+    """
+    Filter conformers based on RMSD threshold.
+
+    All geometries are stacked, centered and transposed to (3, M, N) once, and
+    the conformers within the threshold of each surviving conformer are flagged in a
+    single (parallel with Numba) call over all later surviving conformers. Pairs
+    whose radii of gyration differ by at least the threshold are skipped since their
+    RMSD cannot be lower.
+
+    Args:
+        conformers: A list of Structure objects to filter. Atoms are assumed to be
+            indexed identically across the conformers.
+        threshold: The RMSD threshold for filtering in Bohr (or `length_unit`).
+        symmetry: Symmetry (atom renumbering) is not supported by this backend. Pass
+            `backend="rdkit"` to consider symmetries.
+        align: Whether to optimally superimpose each pair of conformers before
+            calculating their RMSD.
+        length_unit: The unit of length of the threshold, as for the RMSDs of
+            `_rmsd_qcinf`. Default is "bohr".
+        dtype: The floating point type in which the centered geometries are stored
+            for the batched RMSDs. Defaults to single precision, which halves the
+            memory traffic and is ample for coordinates in Bohr. Accumulation and
+            the QCP solve are always done in double precision. Only used if
+            `align`.
+        num_threads: The number of threads for the parallel RMSD kernel. Defaults to
+            Numba's setting (all cores unless `NUMBA_NUM_THREADS` is set). Ignored
+            without Numba.
+
+    Returns:
+        List of conformers indices that meet the RMSD threshold.
+    """
+    if not conformers:
+        return []
+    for conformer in conformers[1:]:
+        _check_compatible(conformers[0], conformer, symmetry)
+
+    if length_unit == LengthUnit.ANGSTROM:
+        threshold = threshold * constants.ANGSTROM_TO_BOHR
+
+    geoms = np.stack([conformer.geometry for conformer in conformers])
+    # Centroids are invariant per conformer so center every geometry only once
+    centroids = geoms.mean(axis=1)
+    centered = geoms - centroids[:, None, :]
+    # Radii of gyration. By the triangle inequality |rg_i - rg_j| <= RMSD_ij, so
+    # pairs whose radii differ by at least the threshold need no RMSD calculation.
+    # Unaligned RMSDs are never lower than aligned ones so the bound holds for both.
+    rg = np.sqrt((centered**2).sum(axis=2).mean(axis=1))
+    n_conformers = len(conformers)
+    filtered = np.zeros(n_conformers, dtype=bool)
+
+    if not align:
+        for i in range(n_conformers - 1):
+            if filtered[i]:
+                continue
+            candidates = ~filtered
+            candidates[: i + 1] = False
+            candidates &= np.abs(rg - rg[i]) < threshold
+            diff = geoms[candidates] - geoms[i]
+            rmsds = np.sqrt(np.einsum("kna,kna->k", diff, diff) / geoms.shape[1])
+            filtered[np.flatnonzero(candidates)[rmsds < threshold]] = True
+        return np.flatnonzero(~filtered).tolist()
+
+    # Transposed once to structure-of-arrays (3, M, N): each conformer's x, y and z
+    # are contiguous rows so the kernel vectorizes over atoms.
+    centered_soa = aligned_empty((3, *centered.shape[:2]), dtype)
+    centered_soa[...] = centered.transpose(2, 0, 1)
+    with _kernels.num_threads(num_threads):
+        for i in range(n_conformers - 1):
+            if not filtered[i]:
+                filtered |= filter_column_soa(i, filtered, centered_soa, rg, threshold)
+
+    return np.flatnonzero(~filtered).tolist()
+
+
+# --- internal helper functions for qcinf --- #
+
+
+def _check_compatible(struct1: Structure, struct2: Structure, symmetry: bool) -> None:
+    """Raise a ValueError if the structures cannot be compared index-by-index."""
+    if symmetry:
+        raise ValueError(
+            "The 'qcinf' backend does not support `symmetry=True`. Pass "
+            "`symmetry=False` or use `backend='rdkit'`."
+        )
+    if len(struct1.symbols) != len(struct2.symbols):
+        raise ValueError(
+            "Structures must have the same number of atoms. Got "
+            f"{len(struct1.symbols)} and {len(struct2.symbols)}."
+        )
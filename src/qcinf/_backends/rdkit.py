@@ -193,18 +193,14 @@ def _align_rdkit(
     else:
         rmsd_val, trnsfm_matrix = rdMolAlign.GetAlignmentTransform(mol, refmol)
 
-    # Convert to homogeneous coordinates in Angstroms
-    coords_homogeneous = np.hstack(
-        [struct.geometry_angstrom, np.ones((struct.geometry.shape[0], 1))]
-    )
-
-    # Apply the transformation matrix
-    transformed_coords_homogeneous = coords_homogeneous @ trnsfm_matrix.T
-
-    # Extract the transformed 3D coordinates and convert to Bohr
+    # Apply the rotation and translation blocks of the 4x4 transformation matrix
+    # directly (in Angstroms) rather than building (N, 4) homogeneous coordinates,
+    # then convert to Bohr
+    rotation = trnsfm_matrix[:3, :3]
+    translation = trnsfm_matrix[:3, 3]
     transformed_coords = (
-        transformed_coords_homogeneous[:, :3] * constants.ANGSTROM_TO_BOHR
-    )
+        struct.geometry_angstrom @ rotation.T + translation
+    ) * constants.ANGSTROM_TO_BOHR
 
     # Reorder the atoms to match the reference structure
     if symmetry:
@@ -2,6 +2,9 @@ import os
 import threading
 from contextlib import contextmanager
 
+import numpy as np
+import numpy.typing as npt
+
 # one global lock per process
 _STDERR_LOCK = threading.Lock()
 
@@ -31,3 +34,27 @@ def mute_c_stderr():
         finally:
             os.dup2(orig_fd, 2)  #  Restore real stderr
             os.close(orig_fd)
+
+
+def aligned_empty(
+    shape: tuple[int, ...], dtype: npt.DTypeLike = np.float64, alignment: int = 64
+) -> np.ndarray:
+    """
+    Return an uninitialized C-contiguous array whose data starts on an aligned address.
+
+    Aligned, contiguous buffers let NumPy and Numba use full-width SIMD loads.
+
+    Args:
+        shape: The shape of the array.
+        dtype: The data type of the array.
+        alignment: The byte alignment of the first element. Defaults to 64 (a cache
+            line, and sufficient for AVX2 and AVX-512).
+
+    Returns:
+        The aligned array.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    nbytes = int(np.prod(shape)) * itemsize
+    buffer = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = -buffer.ctypes.data % alignment
+    return buffer[offset : offset + nbytes].view(dtype).reshape(shape)
@@ -1,14 +1,15 @@
 """Top-level functions for structure conversion algorithms."""
 
-from typing import Any, Callable, Union
+from typing import Any, Union
 
 from qcio import Structure
 
-from qcinf._backends import openbabel, rdkit
+from qcinf._backends import _resolve_backend
 
-_SMILES_TO_STRUCTURE_BACKENDS: dict[str, Callable[..., Structure]] = {
-    "rdkit": rdkit._smiles_to_structure_rdkit,
-    "openbabel": openbabel._smiles_to_structure_ob,
+# Backend modules are imported on first use (see `_resolve_backend`)
+_SMILES_TO_STRUCTURE_BACKENDS: dict[str, str] = {
+    "rdkit": "rdkit._smiles_to_structure_rdkit",
+    "openbabel": "openbabel._smiles_to_structure_ob",
 }
 
 
@@ -32,18 +33,13 @@ def smiles_to_structure(
     Raises:
         ValueError: If the backend is not one of the supported options.
     """
-    try:
-        fn = _SMILES_TO_STRUCTURE_BACKENDS[backend.lower()]
-    except KeyError as e:
-        raise ValueError(
-            f"Unknown backend '{backend}'.  Known: {_SMILES_TO_STRUCTURE_BACKENDS.keys()}"
-        ) from e
+    fn = _resolve_backend(_SMILES_TO_STRUCTURE_BACKENDS, backend)
     return fn(smiles, force_field=force_field, **struct_kwargs)
 
 
-_SMILES_BACKENDS: dict[str, Callable[..., str]] = {
-    "rdkit": rdkit._structure_to_smiles_rdkit,
-    "openbabel": openbabel._structure_to_smiles_ob,
+_SMILES_BACKENDS: dict[str, str] = {
+    "rdkit": "rdkit._structure_to_smiles_rdkit",
+    "openbabel": "openbabel._structure_to_smiles_ob",
 }
 
 
@@ -69,10 +65,5 @@ def structure_to_smiles(
         Canonical SMILES str.
     """
     opts = options or {}
-    try:
-        fn = _SMILES_BACKENDS[backend.lower()]
-    except KeyError as e:
-        raise ValueError(
-            f"Unknown backend '{backend}'.  Known: {_SMILES_BACKENDS.keys()}"
-        ) from e
-    return fn(struct, hydrogens=hydrogens, **opts)  # type: ignore[arg-type]
+    fn = _resolve_backend(_SMILES_BACKENDS, backend)
+    return fn(struct, hydrogens=hydrogens, **opts)
@@ -1,13 +1,14 @@
 """Top-level functions for geometry-related algorithms."""
 
-from typing import Callable
-
+import numpy as np
 from qcio import Structure
 
-from qcinf._backends import rdkit
+from qcinf._backends import _resolve_backend
 
-_RMSD_BACKEND_MAP: dict[str, Callable[..., float]] = {
-    "rdkit": rdkit._rmsd_rdkit,
+# Backend modules are imported on first use (see `_resolve_backend`)
+_RMSD_BACKEND_MAP: dict[str, str] = {
+    "rdkit": "rdkit._rmsd_rdkit",
+    "qcinf": "qcinf._rmsd_qcinf",
 }
 
 
@@ -23,7 +24,8 @@ def rmsd(
     Args:
         struct1: The first structure.
         struct2: The second structure.
-        backend: The backend to use for the RMSD calculation. Can be 'rdkit'.
+        backend: The backend to use for the RMSD calculation. Can be 'rdkit' or
+            'qcinf'. The 'qcinf' backend does not consider symmetry.
         **kwargs: Backend-specific additional keywords to pass to the RMSD calculation
             function. This can include options like 'symmetry' for symmetry-based RMSD
             calculations. The specific options depend on the backend used. See
@@ -35,17 +37,13 @@ def rmsd(
     Raises:
         ValueError: If the backend is not one of the supported options.
     """
-    try:
-        fn = _RMSD_BACKEND_MAP[backend.lower()]
-    except KeyError as e:
-        raise ValueError(
-            f"Unknown backend '{backend}'.  Known: {list(_RMSD_BACKEND_MAP)}"
-        ) from e
+    fn = _resolve_backend(_RMSD_BACKEND_MAP, backend)
     return fn(struct1, struct2, **kwargs)
 
 
-_ALIGN_BACKEND_MAP: dict[str, Callable[..., tuple[Structure, float]]] = {
-    "rdkit": rdkit._align_rdkit,
+_ALIGN_BACKEND_MAP: dict[str, str] = {
+    "rdkit": "rdkit._align_rdkit",
+    "qcinf": "qcinf._align_qcinf",
 }
 
 
@@ -62,22 +60,24 @@ def align(
     Args:
         struct: The structure to align.
         refstruct: The reference structure to align against.
-        backend: The backend to use for the alignment. Can be 'rdkit'.
+        backend: The backend to use for the alignment. Can be 'rdkit' or 'qcinf'.
+            The 'qcinf' backend does not consider symmetry.
         symmetry: Whether to use symmetry in the alignment. Defaults to False.
         **kwargs: Additional keyword arguments to pass to the alignment function.
 
     Returns:
         A tuple containing the RMSD and the aligned structure.
     """
-    try:
-        fn = _ALIGN_BACKEND_MAP[backend.lower()]
-    except KeyError as e:
-        raise ValueError(
-            f"Unknown backend '{backend}'.  Known: {list(_ALIGN_BACKEND_MAP)}"
-        ) from e
+    fn = _resolve_backend(_ALIGN_BACKEND_MAP, backend)
     return fn(struct, refstruct, symmetry=symmetry, **kwargs)
 
 
+_FILTER_CONFORMERS_BACKEND_MAP: dict[str, str] = {
+    "qcinf": "qcinf._filter_conformers_indices_qcinf",
+    "qcinf-gpu": "cupy._filter_conformers_indices_cupy",
+}
+
+
 def filter_conformers_indices(
     conformers: list[Structure],
     threshold: float = 1.0,
@@ -90,31 +90,45 @@ def filter_conformers_indices(
         conformers: A list of Structure objects to filter
         threshold: The RMSD threshold for filtering in Bohr. Defaults to 1.0 Bohr
             (0.53 Angstrom).
-        backend: The backend to use for the RMSD calculation. Can be 'rdkit'.
+        backend: The backend to use for the RMSD calculation. Can be 'rdkit',
+            'qcinf', or 'qcinf-gpu' (requires CuPy; for many large conformers). The
+            'qcinf' backends do not consider symmetry.
         **rmsd_kwargs: Additional keyword arguments to pass to the RMSD calculation
             function. This can include options like 'symmetry' for symmetry-based RMSD
             calculations. The specific options depend on the backend used. See
-            [qcinf._backends.<backend>._rmsd_<backend>] for details.
+            [qcinf._backends.<backend>._rmsd_<backend>] for details. The 'qcinf'
+            backends accept 'symmetry', 'align' and 'length_unit' (plus 'dtype' and
+            'num_threads' for 'qcinf'); see
+            [qcinf._backends.qcinf._filter_conformers_indices_qcinf].
 
     Returns:
         List of conformers indices that meet the RMSD threshold.
     """
-    filtered = set()
+    # Backends with a dedicated (batched) implementation
+    if backend.lower() in _FILTER_CONFORMERS_BACKEND_MAP:
+        batched_fn = _resolve_backend(_FILTER_CONFORMERS_BACKEND_MAP, backend)
+        return batched_fn(conformers, threshold=threshold, **rmsd_kwargs)
+
+    filtered = np.zeros(len(conformers), dtype=bool)
     for i in range(len(conformers)):
-        if i not in filtered:
-            for j in range(i + 1, len(conformers)):
-                if (
-                    rmsd(
-                        conformers[i],
-                        conformers[j],
-                        backend=backend,
-                        **rmsd_kwargs,
-                    )
-                    < threshold
-                ):
-                    filtered.add(j)
-
-    return [i for i in range(len(conformers)) if i not in filtered]
+        if filtered[i]:
+            continue
+        for j in range(i + 1, len(conformers)):
+            # Already removed; its RMSD to i cannot change the result
+            if filtered[j]:
+                continue
+            if (
+                rmsd(
+                    conformers[i],
+                    conformers[j],
+                    backend=backend,
+                    **rmsd_kwargs,
+                )
+                < threshold
+            ):
+                filtered[j] = True
+
+    return np.flatnonzero(~filtered).tolist()
 
 
 def filter_conformers(
@@ -129,7 +143,9 @@ def filter_conformers(
         conformers: A list of Structure objects to filter
         threshold: The RMSD threshold for filtering in Bohr. Defaults to 1.0 Bohr
             (0.53 Angstrom).
-        backend: The backend to use for the RMSD calculation. Can be 'rdkit'.
+        backend: The backend to use for the RMSD calculation. Can be 'rdkit',
+            'qcinf', or 'qcinf-gpu' (requires CuPy; for many large conformers). The
+            'qcinf' backends do not consider symmetry.
         **rmsd_kwargs: Additional keyword arguments to pass to the RMSD calculation
             function. This can include options like 'symmetry' for symmetry-based RMSD
             calculations. The specific options depend on the backend used. See
@@ -1,4 +1,7 @@
 
+import math
+from typing import Callable
+
 import numpy as np
 from qcio import Structure
 
@@ -14,17 +17,49 @@ def rotation_matrix(axis: str, angle_deg: float) -> np.ndarray:
     Returns:
         np.ndarray: 3x3 rotation matrix.
     """
-    theta = np.radians(angle_deg)
-    c, s = np.cos(theta), np.sin(theta)
-
-    if axis.lower() == "x":
-        return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
-    elif axis.lower() == "y":
-        return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
-    elif axis.lower() == "z":
-        return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+    try:
+        fill = _ROTATION_FILLERS[axis.lower()]
+    except KeyError as e:
+        raise ValueError("Axis must be 'x', 'y', or 'z'.") from e
+    if angle_deg % 90 == 0:
+        # Exact cos/sin for quarter turns so inverse rotations cancel exactly.
+        c, s = _QUARTER_TURN_COS_SIN[int(angle_deg // 90) % 4]
     else:
-        raise ValueError("Axis must be 'x', 'y', or 'z'.")
+        theta = math.radians(angle_deg)
+        c, s = math.cos(theta), math.sin(theta)
+    out = np.empty((3, 3))
+    fill(c, s, out)
+    return out
+
+
+def _fill_rotation_x(c: float, s: float, out: np.ndarray) -> None:
+    """Fill out with the rotation matrix about x for cos(theta)=c, sin(theta)=s."""
+    out[0, 0], out[0, 1], out[0, 2] = 1.0, 0.0, 0.0
+    out[1, 0], out[1, 1], out[1, 2] = 0.0, c, -s
+    out[2, 0], out[2, 1], out[2, 2] = 0.0, s, c
+
+
+def _fill_rotation_y(c: float, s: float, out: np.ndarray) -> None:
+    """Fill out with the rotation matrix about y for cos(theta)=c, sin(theta)=s."""
+    out[0, 0], out[0, 1], out[0, 2] = c, 0.0, s
+    out[1, 0], out[1, 1], out[1, 2] = 0.0, 1.0, 0.0
+    out[2, 0], out[2, 1], out[2, 2] = -s, 0.0, c
+
+
+def _fill_rotation_z(c: float, s: float, out: np.ndarray) -> None:
+    """Fill out with the rotation matrix about z for cos(theta)=c, sin(theta)=s."""
+    out[0, 0], out[0, 1], out[0, 2] = c, -s, 0.0
+    out[1, 0], out[1, 1], out[1, 2] = s, c, 0.0
+    out[2, 0], out[2, 1], out[2, 2] = 0.0, 0.0, 1.0
+
+
+_QUARTER_TURN_COS_SIN = ((1.0, 0.0), (0.0, 1.0), (-1.0, 0.0), (0.0, -1.0))
+
+_ROTATION_FILLERS: dict[str, Callable[[float, float, np.ndarray], None]] = {
+    "x": _fill_rotation_x,
+    "y": _fill_rotation_y,
+    "z": _fill_rotation_z,
+}
 
 
 def rotate_structure(struct: Structure, axis: str, angle_deg: float) -> Structure:
@@ -40,9 +75,9 @@ def rotate_structure(struct: Structure, axis: str, angle_deg: float) -> Structur
         Structure: New structure with rotated coordinates.
     """
     R = rotation_matrix(axis, angle_deg)
-    # Dump the structure to a dictionary and modify the geometry.
-    new_struct = struct.model_dump()
     # Apply rotation: for each coordinate, multiply with the rotation matrix.
     # We use R.T because our coordinates are row vectors.
-    new_struct["geometry"] = np.dot(struct.geometry, R.T)
-    return Structure.model_validate(new_struct)
+    # model_copy skips re-validation; deep so nothing aliases the input
+    return struct.model_copy(
+        update={"geometry": np.dot(struct.geometry, R.T)}, deep=True
+    )
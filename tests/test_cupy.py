@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from qcio import Structure
+
+pytest.importorskip("cupy")  # tries `import cupy` skips tests if not installed
+
+from qcinf._backends.cupy import _filter_conformers_indices_cupy
+from qcinf._backends.qcinf import _filter_conformers_indices_qcinf
+
+
+@pytest.mark.parametrize("threshold", [0.3, 0.8, 1.5])
+def test_filter_conformers_matches_cpu(threshold):
+    rng = np.random.default_rng(3)
+    base = rng.normal(size=(15, 3)) * 3.0
+    conformers = [
+        Structure(
+            symbols=["C"] * 15,
+            geometry=base + rng.normal(size=(15, 3)) * rng.uniform(0.0, 1.0),
+        )
+        for _ in range(40)
+    ]
+    assert _filter_conformers_indices_cupy(
+        conformers, threshold, gpu_min_size=0
+    ) == _filter_conformers_indices_qcinf(conformers, threshold)
@@ -1,10 +1,15 @@
+import importlib
+from types import ModuleType, SimpleNamespace
+
 import numpy as np
 import pytest
 from qcconst import constants
 from qcconst.constants import ANGSTROM_TO_BOHR
 from qcio import ConformerSearchResults, Structure
 
-from qcinf import align, filter_conformers_indices, rmsd
+from qcinf import _backends, align, filter_conformers_indices, rmsd
+from qcinf.algorithms import conversion, geometry
+from qcinf.utils import rotate_structure
 
 
 def test_rmsd_identical_structures():
@@ -289,3 +294,47 @@ def test_conformers_filtered(test_data_dir):
     #         keep_indices.conformer_energies[i]
     #         == csr.conformer_energies_relative[selected[i]]
     #     )
+
+
+def test_conformers_filtered_qcinf(test_data_dir):
+    csr = ConformerSearchResults.open(test_data_dir / "conf_search.json")
+    rotated = [rotate_structure(conf, "z", 90.0) for conf in csr.conformers[:3]]
+    keep_indices = filter_conformers_indices(
+        csr.conformers + rotated,
+        backend="qcinf",
+        threshold=0.47 * constants.ANGSTROM_TO_BOHR,
+    )
+    assert keep_indices == list(range(len(csr.conformers)))
+
+
+def test_unknown_backend_raises(water):
+    with pytest.raises(ValueError, match="Unknown backend"):
+        rmsd(water, water, backend="nope")
+    with pytest.raises(ValueError, match="Unknown backend"):
+        align(water, water, backend="nope")
+
+
+def test_backends_imported_lazily(monkeypatch, water):
+    """Backend modules are imported on first dispatch, once, and then cached."""
+    assert not any(
+        isinstance(value, ModuleType) and value.__name__.startswith("qcinf._backends.")
+        for module in (geometry, conversion)
+        for value in vars(module).values()
+    )
+    imported = []
+
+    def import_module(name):
+        imported.append(name)
+        return importlib.import_module(name)
+
+    monkeypatch.setattr(_backends, "_RESOLVED_BACKENDS", {})
+    # Only count the imports made by `_resolve_backend` (Numba's cache also imports
+    # modules when kernels compile lazily)
+    monkeypatch.setattr(
+        _backends, "importlib", SimpleNamespace(import_module=import_module)
+    )
+    rmsd(water, water, backend="qcinf")
+    rmsd(water, water, backend="QCINF")
+    align(water, water, backend="qcinf")
+    # One import per backend function (rmsd and align), none for the cached call
+    assert imported == ["qcinf._backends.qcinf", "qcinf._backends.qcinf"]
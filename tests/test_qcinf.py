@@ -0,0 +1,315 @@
+import numpy as np
+import pytest
+from qcconst import constants
+from qcio import LengthUnit, Structure
+
+from qcinf._backends import _superposition
+from qcinf._backends._kernels import _quat_rotation_3x3, _rmsd_kernel
+from qcinf._backends._superposition import (
+    compute_rmsd,
+    compute_rmsd_batch_soa,
+    filter_column_soa,
+    kabsch,
+    kabsch_centered,
+)
+from qcinf._backends.qcinf import (
+    _align_batch_qcinf,
+    _align_qcinf,
+    _filter_conformers_indices_qcinf,
+    _rmsd_qcinf,
+)
+from qcinf._backends.utils import aligned_empty
+from qcinf.utils import rotate_structure
+
+
+def _random_rotation(rng: np.random.Generator) -> np.ndarray:
+    q = rng.normal(size=4)
+    w, x, y, z = q / np.linalg.norm(q)
+    return np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+            [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+            [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+
+
+def _svd_rmsd(P: np.ndarray, Q: np.ndarray) -> float:
+    """Reference Kabsch RMSD using an SVD of the covariance matrix."""
+    P_centered = P - P.mean(axis=0)
+    Q_centered = Q - Q.mean(axis=0)
+    U, _, Vt = np.linalg.svd(P_centered.T @ Q_centered)
+    if np.linalg.det(U) * np.linalg.det(Vt) < 0:
+        Vt[-1] *= -1
+    diff = P_centered @ U @ Vt - Q_centered
+    return float(np.sqrt((diff**2).sum(axis=1).mean()))
+
+
+@pytest.mark.parametrize("n_atoms", [3, 5, 20, 100])
+def test_kabsch_matches_svd(n_atoms):
+    rng = np.random.default_rng(n_atoms)
+    P = rng.normal(size=(n_atoms, 3)) * 3.0
+    Q = P @ _random_rotation(rng).T + rng.normal(size=(n_atoms, 3)) * 0.3 + 1.0
+    R, centroid_P, centroid_Q = kabsch(P, Q)
+    assert np.allclose(R @ R.T, np.eye(3))
+    assert np.linalg.det(R) == pytest.approx(1.0)
+    assert np.allclose(centroid_P, P.mean(axis=0))
+    assert np.allclose(centroid_Q, Q.mean(axis=0))
+    assert compute_rmsd(P, Q) == pytest.approx(_svd_rmsd(P, Q), abs=1e-10)
+
+
+def test_kabsch_recovers_rotation():
+    rng = np.random.default_rng(0)
+    P = rng.normal(size=(10, 3))
+    R_true = _random_rotation(rng)
+    R, _, _ = kabsch(P, P @ R_true.T)
+    assert np.allclose(R, R_true)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_kabsch_centered_matches_covariance_path(dtype):
+    rng = np.random.default_rng(2)
+    P = rng.normal(size=(30, 3))
+    Q = P @ _random_rotation(rng).T + rng.normal(size=(30, 3)) * 0.2
+    P, Q = P - P.mean(axis=0), Q - Q.mean(axis=0)
+    expected = _quat_rotation_3x3(np.ascontiguousarray(P.T @ Q))
+    R = kabsch_centered(P.astype(dtype), Q.astype(dtype))
+    assert R.dtype == np.float64
+    assert np.allclose(R, expected, atol=1e-5 if dtype == np.float32 else 1e-12)
+
+
+def test_kabsch_linear_molecule():
+    """Degenerate eigenvalues (linear molecules) still give an optimal rotation."""
+    rng = np.random.default_rng(1)
+    P = np.outer(np.array([-1.0, 0.0, 1.1]), np.array([0.3, -0.5, 0.8]))
+    Q = P @ _random_rotation(rng).T + 2.0
+    R, _, _ = kabsch(P, Q)
+    assert np.linalg.det(R) == pytest.approx(1.0)
+    assert compute_rmsd(P, Q) == pytest.approx(0.0, abs=1e-8)
+
+
+@pytest.mark.parametrize("align", [True, False])
+def test_rmsd_kernel_matches_numpy(align):
+    rng = np.random.default_rng(7)
+    P = rng.normal(size=(12, 3)) * 2.0
+    Q = P @ _random_rotation(rng).T + rng.normal(size=(12, 3)) * 0.1
+    expected = _svd_rmsd(P, Q) if align else np.sqrt(((P - Q) ** 2).sum(axis=1).mean())
+    assert _rmsd_kernel(P, Q, align) == pytest.approx(expected, abs=1e-10)
+
+
+def test_compute_rmsd_no_align():
+    P = np.zeros((4, 3))
+    Q = np.ones((4, 3))
+    assert compute_rmsd(P, Q, align=False) == pytest.approx(np.sqrt(3.0))
+    assert compute_rmsd(P, Q) == pytest.approx(0.0)
+
+
+def test_rmsd_identity(water):
+    assert _rmsd_qcinf(water, water) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_rmsd_alignment_happens_before_rmsd(water):
+    water2 = rotate_structure(water, "z", 90.0)
+    assert _rmsd_qcinf(water, water2) == pytest.approx(0.0, abs=1e-6)
+    assert _rmsd_qcinf(water, water2, align=False) > 0.1
+
+
+def test_rmsd_length_unit(water):
+    shifted = Structure(symbols=water.symbols, geometry=water.geometry * 1.1)
+    rmsd_bohr = _rmsd_qcinf(water, shifted)
+    rmsd_angstrom = _rmsd_qcinf(water, shifted, length_unit=LengthUnit.ANGSTROM)
+    assert rmsd_angstrom == pytest.approx(rmsd_bohr * constants.BOHR_TO_ANGSTROM)
+
+
+def test_rmsd_symmetry_raises(water):
+    with pytest.raises(ValueError):
+        _rmsd_qcinf(water, water, symmetry=True)
+
+
+def test_rmsd_different_atom_counts_raises(water):
+    struct = Structure(symbols=water.symbols[:2], geometry=water.geometry[:2])
+    with pytest.raises(ValueError):
+        _rmsd_qcinf(water, struct)
+
+
+def test_align(water):
+    water2 = rotate_structure(water, "x", 37.0)
+    aligned, rmsd = _align_qcinf(water2, water)
+    assert rmsd == pytest.approx(0.0, abs=1e-6)
+    assert np.allclose(aligned.geometry, water.geometry, atol=1e-6)
+    assert aligned.symbols == water2.symbols
+
+
+def test_align_does_not_alias_input(water):
+    struct = water.model_copy(update={"extras": {"a": 1}}, deep=True)
+    aligned, _ = _align_qcinf(struct, water)
+    aligned.extras["b"] = 2
+    aligned.symbols.append("H")
+    assert struct.extras == {"a": 1}
+    assert len(struct.symbols) == 3
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_filter_conformers_matches_pairwise(dtype):
+    rng = np.random.default_rng(3)
+    base = rng.normal(size=(15, 3)) * 3.0
+    conformers = [
+        Structure(
+            symbols=["C"] * 15,
+            geometry=base @ _random_rotation(rng).T
+            + rng.normal(size=(15, 3)) * rng.uniform(0.0, 1.0),
+        )
+        for _ in range(25)
+    ]
+    threshold = 0.8
+
+    expected: list[int] = []
+    for i, conf in enumerate(conformers):
+        if all(_rmsd_qcinf(conformers[k], conf) >= threshold for k in expected):
+            expected.append(i)
+
+    assert (
+        _filter_conformers_indices_qcinf(conformers, threshold, dtype=dtype) == expected
+    )
+    assert (
+        _filter_conformers_indices_qcinf(conformers, threshold, num_threads=1)
+        == expected
+    )
+    assert 1 < len(expected) < len(conformers)
+
+
+@pytest.mark.parametrize("align", [True, False])
+def test_filter_conformers_align_and_length_unit(align):
+    rng = np.random.default_rng(8)
+    base = rng.normal(size=(10, 3)) * 2.0
+    conformers = [
+        Structure(
+            symbols=["C"] * 10,
+            geometry=base + rng.normal(size=(10, 3)) * rng.uniform(0.0, 0.8),
+        )
+        for _ in range(20)
+    ]
+    threshold = 0.3  # Angstrom
+    kwargs = {"align": align, "length_unit": LengthUnit.ANGSTROM}
+
+    expected: list[int] = []
+    for i, conf in enumerate(conformers):
+        if all(
+            _rmsd_qcinf(conformers[k], conf, **kwargs) >= threshold for k in expected
+        ):
+            expected.append(i)
+
+    assert _filter_conformers_indices_qcinf(conformers, threshold, **kwargs) == expected
+    assert 1 < len(expected) < len(conformers)
+
+
+def test_compute_rmsd_centered():
+    rng = np.random.default_rng(11)
+    P = rng.normal(size=(8, 3)) + 5.0
+    Q = P @ _random_rotation(rng).T + rng.normal(size=(8, 3)) * 0.2 - 3.0
+    P_centered = P - P.mean(axis=0)
+    Q_centered = Q - Q.mean(axis=0)
+    assert np.allclose(kabsch_centered(P_centered, Q_centered), kabsch(P, Q)[0])
+    assert compute_rmsd(P_centered, Q_centered, centered=True) == pytest.approx(
+        compute_rmsd(P, Q)
+    )
+
+
+def test_align_batch_matches_align(water):
+    structs = [rotate_structure(water, axis, 25.0) for axis in "xyz"]
+    structs.append(Structure(symbols=water.symbols, geometry=water.geometry * 1.05))
+    aligned = _align_batch_qcinf(structs, water)
+    assert len(aligned) == len(structs)
+    for struct, batch_aligned in zip(structs, aligned):
+        single_aligned, _ = _align_qcinf(struct, water)
+        assert batch_aligned.symbols == struct.symbols
+        assert np.allclose(batch_aligned.geometry, single_aligned.geometry)
+    assert _align_batch_qcinf([], water) == []
+
+
+def test_align_batch_does_not_alias_input(water):
+    structs = [
+        rotate_structure(water, axis, 25.0).model_copy(update={"extras": {"a": 1}})
+        for axis in "xy"
+    ]
+    for struct, aligned in zip(structs, _align_batch_qcinf(structs, water)):
+        aligned.extras["b"] = 2
+        aligned.symbols.append("H")
+        assert struct.extras == {"a": 1}
+        assert len(struct.symbols) == 3
+
+
+def test_radius_of_gyration_bounds_rmsd():
+    """The pre-filter used by `_filter_conformers_indices_qcinf` is a lower bound."""
+    rng = np.random.default_rng(5)
+    for _ in range(50):
+        P = rng.normal(size=(10, 3)) * rng.uniform(0.5, 3.0)
+        Q = rng.normal(size=(10, 3)) * rng.uniform(0.5, 3.0)
+        rg_P = np.sqrt(((P - P.mean(axis=0)) ** 2).sum(axis=1).mean())
+        rg_Q = np.sqrt(((Q - Q.mean(axis=0)) ** 2).sum(axis=1).mean())
+        assert abs(rg_P - rg_Q) <= compute_rmsd(P, Q) + 1e-12
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_aligned_empty(dtype):
+    arr = aligned_empty((7, 5, 3), dtype)
+    assert arr.shape == (7, 5, 3)
+    assert arr.dtype == dtype
+    assert arr.flags.c_contiguous
+    assert arr.ctypes.data % 64 == 0
+
+
+def test_compute_rmsd_non_contiguous_input():
+    rng = np.random.default_rng(2)
+    P = rng.normal(size=(3, 9)).T  # Fortran ordered (9, 3) view
+    Q = P @ _random_rotation(rng).T
+    assert not P.flags.c_contiguous
+    assert compute_rmsd(P, Q) == pytest.approx(0.0, abs=1e-10)
+
+
+@pytest.mark.parametrize("numba", [True, False])
+def test_filter_column_soa(monkeypatch, numba):
+    if not numba:
+        monkeypatch.setattr(_superposition, "_NUMBA_ERR", ModuleNotFoundError("numba"))
+    rng = np.random.default_rng(6)
+    coords = rng.normal(size=(12, 10, 3)) * rng.uniform(0.5, 1.5, size=(12, 1, 1))
+    coords -= coords.mean(axis=1, keepdims=True)
+    soa = np.ascontiguousarray(coords.transpose(2, 0, 1))
+    rg = np.sqrt((coords**2).sum(axis=2).mean(axis=1))
+    filtered = np.zeros(12, dtype=bool)
+    filtered[[5, 9]] = True
+    threshold = 1.3
+
+    close = filter_column_soa(2, filtered, soa, rg, threshold)
+    expected = np.zeros(12, dtype=bool)
+    for j in range(3, 12):
+        expected[j] = not filtered[j] and (
+            compute_rmsd(coords[2], coords[j]) < threshold
+        )
+    assert np.array_equal(close, expected)
+    assert expected.any()
+
+
+def test_compute_rmsd_batch_soa():
+    """Batched SVD path, including the reflection correction."""
+    rng = np.random.default_rng(7)
+    ref = rng.normal(size=(9, 3))
+    coords = np.stack(
+        [ref]
+        + [
+            ref @ _random_rotation(rng).T + rng.normal(size=(9, 3)) * 0.3
+            for _ in range(4)
+        ]
+        + [ref * [1.0, 1.0, -1.0]]  # mirror image: the unconstrained SVD reflects
+    )
+    coords -= coords.mean(axis=1, keepdims=True)
+    soa = np.ascontiguousarray(coords.transpose(2, 0, 1))
+    mask = np.ones(len(coords), dtype=bool)
+    mask[2] = False
+
+    rmsds = compute_rmsd_batch_soa(soa[:, 0], soa, mask)
+    assert np.isinf(rmsds[2])
+    for j in np.flatnonzero(mask):
+        assert rmsds[j] == pytest.approx(_svd_rmsd(coords[0], coords[j]), abs=1e-10)
+    assert rmsds[-1] > 0.1
+    assert np.all(np.isinf(compute_rmsd_batch_soa(soa[:, 0], soa, np.zeros_like(mask))))
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from qcinf.utils import rotate_structure, rotation_matrix
+
+
+@pytest.mark.parametrize("axis", ["x", "y", "z", "X"])
+def test_rotation_matrix_is_proper_rotation(axis):
+    R = rotation_matrix(axis, 33.0)
+    assert np.allclose(R @ R.T, np.eye(3))
+    assert np.linalg.det(R) == pytest.approx(1.0)
+    # The rotation axis is left unchanged
+    e = np.eye(3)["xyz".index(axis.lower())]
+    assert np.allclose(R @ e, e)
+
+
+def test_rotation_matrix_direction():
+    # Right-handed: rotating x by 90 degrees about z gives y
+    assert np.allclose(rotation_matrix("z", 90.0) @ [1.0, 0.0, 0.0], [0.0, 1.0, 0.0])
+    assert np.allclose(rotation_matrix("x", 90.0) @ [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])
+    assert np.allclose(rotation_matrix("y", 90.0) @ [0.0, 0.0, 1.0], [1.0, 0.0, 0.0])
+
+
+def test_rotation_matrix_invalid_axis():
+    with pytest.raises(ValueError):
+        rotation_matrix("w", 10.0)
+
+
+def test_rotate_structure(water):
+    rotated = rotate_structure(water, "y", 45.0)
+    assert rotated.symbols == water.symbols
+    assert np.allclose(rotated.geometry, water.geometry @ rotation_matrix("y", 45.0).T)
+    assert np.allclose(
+        rotate_structure(rotated, "y", -45.0).geometry, water.geometry, atol=1e-12
+    )
+
+
+def test_rotate_structure_does_not_alias_input(water):
+    rotated = rotate_structure(water, "z", 30.0)
+    rotated.extras["new"] = 1
+    rotated.symbols.append("H")
+    assert "new" not in water.extras
+    assert len(water.symbols) == 3
+
+
+@pytest.mark.parametrize("axis", ["x", "y", "z"])
+@pytest.mark.parametrize(
+    "angle", [-270.0, -90.0, 0.0, 90.0, 180.0, 270.0, 360.0, 450.0]
+)
+def test_rotation_matrix_quarter_turns_are_exact(axis, angle):
+    R = rotation_matrix(axis, angle)
+    assert np.array_equal(R, np.round(R))
+    assert np.allclose(R, rotation_matrix(axis, angle + 1e-9), atol=1e-9)
+    assert np.array_equal(R @ rotation_matrix(axis, -angle), np.eye(3))